@@ -1,5 +1,45 @@
-def question_format(question: str) -> str:
-    prompt = f"""
+from functools import lru_cache
+
+_NO_VULNERABILITY = "#NoVulnerability found for this question."
+
+_AUDIT_REPORT_SCHEMA = """Audit Report
+
+## Title
+[Clear and specific name of the vulnerability related to the question]
+
+## Summary
+A brief summary of the issue and where in the code it occurs.
+
+## Impact
+Low / Medium / High  (pick the severity based on impact)
+
+## Finding Description
+Explain the vulnerability step by step:
+- **Location:** Identify the file and function or module where the issue lies.
+- **Intended Behavior:** Describe what the code is supposed to do or what the assumptions are.
+- **Actual Behavior:** Describe the flawed logic or condition that breaks the intended behavior.
+- **Exploit Scenario:** Explain how an attacker or unprivileged user/node can trigger this vulnerability (the sequence of calls or events).
+- **Security Breach:** State which security property is violated (e.g., unauthorized access, fund mis-accounting, consensus failure, denial of service, etc.).
+Keep this description concise but factual and convincing.
+
+## Impact Explanation
+Explain the concrete consequences of the exploit: e.g., loss of funds, permanent funds lock, network halt or fork, incorrect accounting, privilege escalation, etc., and why this matters for the protocol.
+
+## Likelihood Explanation
+Discuss how likely this issue is to be encountered or exploited in practice: e.g., can it be triggered by any public user or any node easily? Does it require rare timing or conditions? Is it in a commonly used part of the system or an edge case?
+
+## Recommendation
+Suggest a fix or mitigation: e.g., a code change or additional check to correct the logic. Keep it concise and focus on the core fix (no need for lengthy refactoring suggestions).
+
+## Proof of Concept
+Present a minimal proof-of-concept demonstrating the issue using the project’s own testing framework:
+- **Setup:** Describe any initial state or contracts/nodes setup required (e.g., initializing contracts, starting a local chain, specific balances or parameters).
+- **Trigger:** Describe the actions or transactions to perform (function calls, messages, or inputs that invoke the vulnerable code).
+- **Result:** Describe the observed outcome that indicates the vulnerability (e.g., an incorrect balance change, system panic, consensus divergence, etc.).
+- **Test Snippet:** Provide the actual code for a test case or script that reproduces the issue. Specify where this test code should be added (for example, in which test file and function within the repository). The test should use the existing test infrastructure and include assertions that fail due to the bug or show the exploit’s effect.
+"""
+
+_QUESTION_TEMPLATE = """
 You are a Web3 Security Researcher. Your task is to analyze the given codebase with a laser focus on this single question:
 
 **Security Question (scope for this run):** {question}
@@ -38,50 +78,11 @@ Important rules:
 
 If you find a vulnerability (and only then), produce a report strictly in the following format. If you do **not** find any valid vulnerability, output **only** the line: `#NoVulnerability found for this question.` (with the hashtag, exactly as shown, and nothing else).
 
-Audit Report
-
-## Title
-[Clear and specific name of the vulnerability related to the question]
-
-## Summary
-A brief summary of the issue and where in the code it occurs.
-
-## Impact
-Low / Medium / High  (pick the severity based on impact)
-
-## Finding Description
-Explain the vulnerability step by step:
-- **Location:** Identify the file and function or module where the issue lies.
-- **Intended Behavior:** Describe what the code is supposed to do or what the assumptions are.
-- **Actual Behavior:** Describe the flawed logic or condition that breaks the intended behavior.
-- **Exploit Scenario:** Explain how an attacker or unprivileged user/node can trigger this vulnerability (the sequence of calls or events).
-- **Security Breach:** State which security property is violated (e.g., unauthorized access, fund mis-accounting, consensus failure, denial of service, etc.).
-Keep this description concise but factual and convincing.
-
-## Impact Explanation
-Explain the concrete consequences of the exploit: e.g., loss of funds, permanent funds lock, network halt or fork, incorrect accounting, privilege escalation, etc., and why this matters for the protocol.
-
-## Likelihood Explanation
-Discuss how likely this issue is to be encountered or exploited in practice: e.g., can it be triggered by any public user or any node easily? Does it require rare timing or conditions? Is it in a commonly used part of the system or an edge case?
-
-## Recommendation
-Suggest a fix or mitigation: e.g., a code change or additional check to correct the logic. Keep it concise and focus on the core fix (no need for lengthy refactoring suggestions).
-
-## Proof of Concept
-Present a minimal proof-of-concept demonstrating the issue using the project’s own testing framework:
-- **Setup:** Describe any initial state or contracts/nodes setup required (e.g., initializing contracts, starting a local chain, specific balances or parameters).
-- **Trigger:** Describe the actions or transactions to perform (function calls, messages, or inputs that invoke the vulnerable code).
-- **Result:** Describe the observed outcome that indicates the vulnerability (e.g., an incorrect balance change, system panic, consensus divergence, etc.).
-- **Test Snippet:** Provide the actual code for a test case or script that reproduces the issue. Specify where this test code should be added (for example, in which test file and function within the repository). The test should use the existing test infrastructure and include assertions that fail due to the bug or show the exploit’s effect.
-
+""" + _AUDIT_REPORT_SCHEMA + """
 If **no** vulnerability is found for the given question, output exactly:
-#NoVulnerability found for this question.
-"""
-    return prompt
-
+""" + _NO_VULNERABILITY + "\n"
 
-def validation_format(report: str) -> str:
-    prompt = f"""
+_VALIDATION_TEMPLATE = """
 You are a Senior Web3 Security Researcher (Judge). Your task is **validation** of a single security report/claim for a given question (not grading writing style, but the technical validity of the claim). The string below is the security report/claim you need to investigate and validate:
 
 SECURITY QUESTION / CLAIM (scope for this run):
@@ -142,12 +143,51 @@ Your mission (validation phase):
    - If you conclude this is a **valid vulnerability** that meets all criteria, output the Audit Report in the exact format provided below (same structure as the original report request, including sections Title, Summary, Impact, etc., and incorporating any additional details from your validation).
    - If you conclude **no valid vulnerability** is present, output exactly the single line:
      ```
-     #NoVulnerability found for this question.
+     """ + _NO_VULNERABILITY + """
      ```
    (Make sure to include the leading '#' and follow the exact casing and wording.)
 
+```
+""" + _AUDIT_REPORT_SCHEMA + """```
+
 ================================================================================================================================================
 
 Now, based on the above steps, perform the validation. If the issue is valid, provide the full structured report as specified. If it is invalid or not truly exploitable, respond with the single line rejecting it (as per the format in step 9).
 """
-    return prompt
+
+_QUESTION_PREFIX, _QUESTION_SUFFIX = _QUESTION_TEMPLATE.split("{question}", 1)
+_VALIDATION_PREFIX, _VALIDATION_SUFFIX = _VALIDATION_TEMPLATE.split("{report}", 1)
+
+MAX_QUESTION_LENGTH = 2000
+
+# inputs longer than this are formatted without going through the cache
+_MAX_CACHED_LENGTH = 4096
+
+# drop C0 control characters (except tab/newline/carriage return) and DEL
+_CONTROL_CHARS = dict.fromkeys([c for c in range(32) if chr(c) not in "\t\n\r"] + [127])
+
+
+def _question_format(question: str) -> str:
+    question = question.translate(_CONTROL_CHARS)[:MAX_QUESTION_LENGTH]
+    return _QUESTION_PREFIX + question + _QUESTION_SUFFIX
+
+
+def _validation_format(report: str) -> str:
+    report = report.translate(_CONTROL_CHARS)
+    return _VALIDATION_PREFIX + report + _VALIDATION_SUFFIX
+
+
+_cached_question_format = lru_cache(maxsize=256)(_question_format)
+_cached_validation_format = lru_cache(maxsize=256)(_validation_format)
+
+
+def question_format(question: str) -> str:
+    if len(question) > _MAX_CACHED_LENGTH:
+        return _question_format(question)
+    return _cached_question_format(question)
+
+
+def validation_format(report: str) -> str:
+    if len(report) > _MAX_CACHED_LENGTH:
+        return _validation_format(report)
+    return _cached_validation_format(report)
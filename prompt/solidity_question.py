@@ -1,230 +1,165 @@
+import re
+import sys
+import textwrap
+from functools import cache, lru_cache
+from pathlib import Path
+
+# The prompt bodies live next to this module as plain-text templates with a
+# <<QUESTION>> / <<REPORT>> sentinel and are read on first use.
+_TEMPLATE_DIR = Path(__file__).resolve().parent
+
+# questions_format swaps these single-question passages of the question
+# template (single wording, batch wording, label for errors) for batch wording
+# and appends _BATCH_OUTPUT_FORMAT: the shared instructions are sent once and
+# every answer comes back wrapped in numbered delimiters.
+_BATCH_SWAPS = (
+    (
+        "with a laser focus on this single question:\n\n**Security Question (scope for this run):** <<QUESTION>>",
+        "one question at a time, treating each numbered question below as its own independent run:\n\n"
+        "**Security Questions (scope for this run):**\n<<QUESTIONS>>",
+        "question scope",
+    ),
+    (
+        "find **only ONE** concrete, exploitable vulnerability.",
+        "find at most ONE concrete, exploitable vulnerability per question.",
+        "one-finding rule",
+    ),
+    (
+        "When in doubt, report **“#NoVulnerability found for this question.”**",
+        "When in doubt about a question, put **“#NoVulnerability found for this question.”** in that question's block.",
+        "when-in-doubt rule",
+    ),
+    (
+        "Otherwise, return “#NoVulnerability found for this question.”",
+        "Otherwise, that question's block must contain “#NoVulnerability found for this question.”",
+        "checklist outcome",
+    ),
+    (
+        "If **no** vulnerability is found that matches this exact question, output ONLY (including the hashtag):\n"
+        "#NoVulnerability found for this question.\n\n"
+        "Do not output anything else if there is no vulnerability.\n",
+        "If **no** vulnerability is found for a question, that question's block must contain ONLY (including the hashtag):\n"
+        "#NoVulnerability found for this question.\n",
+        "no-finding output",
+    ),
+)
+
+_BATCH_OUTPUT_FORMAT = """
+Batch output format:
+- Answer every question above, in order, and wrap each answer in its own block, where N is the question's number:
+--- BEGIN REPORT N ---
+(the Audit Report, or #NoVulnerability found for this question.)
+--- END REPORT N ---
+- Output exactly one block per question and nothing outside the blocks.
+"""
+
+# Tolerates CRLF line endings, trailing blanks on the delimiter lines and empty blocks.
+_REPORT_BLOCK = re.compile(
+    r"--- BEGIN REPORT (\d+) ---[ \t]*\r?\n(?:(.*?)\r?\n)?[ \t]*--- END REPORT \1 ---", re.DOTALL
+)
+
+# Upper bound on the size of a single question or report. Anything longer is
+# shortened in the middle so the prompt stays within the model's context.
+MAX_INPUT_CHARS = 40000
+
+# Upper bound on the combined size of the numbered questions in one batch.
+MAX_BATCH_INPUT_CHARS = 2 * MAX_INPUT_CHARS
+
+_TRUNCATION_MARKER = "\n\n[... truncated ...]\n\n"
+
+# Only questions shorter than this are interned; the longest in questions.py is
+# under 350 characters.
+_MAX_INTERNED_LENGTH = 1024
+
+
+def _strip_template(template: str) -> str:
+    lines = textwrap.dedent(template).strip().splitlines()
+    return "\n".join(line.rstrip() for line in lines) + "\n"
+
+
+@cache
+def _template(name: str) -> str:
+    """Read a template once and normalise its whitespace."""
+    return _strip_template((_TEMPLATE_DIR / name).read_text(encoding="utf-8"))
+
+
+@cache
+def _template_parts(name: str, sentinel: str) -> tuple[str, str]:
+    template = _template(name)
+    count = template.count(sentinel)
+    if count != 1:
+        raise ValueError(f"{name}: expected exactly one {sentinel} sentinel, found {count}")
+    prefix, suffix = template.split(sentinel, 1)
+    return prefix, suffix
+
+
+def _replace_once(template: str, old: str, new: str, name: str, label: str) -> str:
+    count = template.count(old)
+    if count != 1:
+        raise ValueError(f"{name}: expected the {label} passage exactly once, found {count}")
+    return template.replace(old, new)
+
+
+@cache
+def _questions_template() -> str:
+    name = "solidity_question.tmpl"
+    template = _template(name)
+    for single, batch, label in _BATCH_SWAPS:
+        template = _replace_once(template, single, batch, name, label)
+    return template + _BATCH_OUTPUT_FORMAT
+
+
+def _truncate_middle(text: str) -> str:
+    if len(text) <= MAX_INPUT_CHARS:
+        return text
+    keep = max(0, (MAX_INPUT_CHARS - len(_TRUNCATION_MARKER)) // 2)
+    if keep == 0:
+        return text[:MAX_INPUT_CHARS]
+    return text[:keep] + _TRUNCATION_MARKER + text[-keep:]
+
+
+@lru_cache(maxsize=512)
+def _question_format(question: str) -> str:
+    prefix, suffix = _template_parts("solidity_question.tmpl", "<<QUESTION>>")
+    return prefix + question + suffix
+
+
+@lru_cache(maxsize=512)
+def _validation_format(report: str) -> str:
+    prefix, suffix = _template_parts("solidity_validation.tmpl", "<<REPORT>>")
+    return prefix + report + suffix
 
 
 def question_format(question: str) -> str:
-    prompt = f"""
-You are a Web3 Security Researcher. Your task is to analyze the given codebase with a laser focus on this single question:
-
-**Security Question (scope for this run):** {question}
-
-Your mission:
-- Use the security question as your starting point. Investigate all code paths, business logic, and protocol assumptions tied to that question and look for one concrete, exploitable vulnerability. Do not debate the premise of the question; accept it and investigate.
-- Explore a wide range of realistic input values and edge cases. Test large and small amounts, atypical decimals, sequence of actions, and boundary conditions to see how state variables change. When mathematics or accounting are involved, check for rounding errors, underflow/overflow, interest miscalculations, or invariant violations. Always use values that could actually be supplied by a user or contract on-chain.
-- Work through complete flows end‑to‑end: simulate how an unprivileged user would call the functions, how storage changes, and how balances or state variables evolve. Consider interactions across helpers, libraries, factories, deployers, pool contracts, configuration modules, and accounting components.
-- If you find a vulnerability, produce a report in the exact format below. If **no** valid vulnerability emerges, clearly state: **“No vulnerability found for this question.”**
-- Do not invent or repeat findings you’ve reported for this question. Stay strictly within the scope defined by the question; don’t add unrelated issues.
-- The security question is your starting point. Your job is to investigate the code related to it and find a concrete, exploitable vulnerability. Do not debate or question the premise of the question be deeply logical. 
-- Try to find **only ONE** valid vulnerability related to this question and think the vulnerability tied to this question .
-- Go deep into the codebase, business logic, and protocol assumptions.
-- If you find a vulnerability, you MUST produce a report in the exact format below.
-- If you do **not** find any valid vulnerability, you MUST clearly say: **"No vulnerability found for this question."**
-- Do **not** invent or repeat vulnerabilities you’ve already reported for this same question.
-- Only stay within the scope of the question. Don’t add extra findings.
-
-Important rules:
-- The vulnerability must be actually triggerable on-chain or off-chain. Pure logic/invariant violations are only valid if you can explain precisely how the invariant is broken.
-- Be 100% certain the issue is exploitable. When in doubt, report **“#Noulnerability found.”**
-- Focus on user‑level attack surfaces (non‑privileged actors) first. If the function is privileged, scrutinise subtle logic errors rather than assuming malicious admins.
-- Provide a working test using the project’s test framework to demonstrate the exploit where possible. If the test or exploit cannot run, the issue is not valid.
-- Findings that only improve gas usage, fix event values, add zero‑address checks, or address user/admin mistakes without harming the protocol are **out of scope**:. Also excluded are:
-  • Gas optimisations, stylistic improvements or UX enhancements
-  • Missing event parameters or incorrect view return values that don’t affect state 
-  • Issues requiring users or admins to input wrong values or call functions in the wrong order
-  • Centralisation risks or reckless admin actions (assume admins are trusted)
-  • Theoretical attacks relying on leaked keys, privileged addresses, 51% attacks, Sybil attacks, stablecoin depegging, sequencer downtime, future code changes, or third‑party oracles misbehaving
-  • Losses of dust amounts, accidental token transfers by users, or missing rewards/airdrops
-  • Unsupported or weird token behaviours (unless explicitly in scope)
-  • Duplicate or previously acknowledged issues
-- Check all places in the codebase where this logic could exist (helpers, libraries, factories, deployers, pool contracts, config, accounting).
-- Focus on user-level attack surface first (non-privileged actors). If the function is privileged, look for subtle logic mistakes.
-- Do not go out of scope.
-- Make Sure u provide a valid test function if its actually a vulnerability using their test setup 
-- Make sure the vulnerability can be triggered if not then its not valid 
-- If its more of like informational with no good impact then its not a vulnerability 
-
-If the issue you identify falls into any of the out‑of‑scope categories above, do not include it in your report. Otherwise, thoroughly test with dynamic values, check all relevant code paths, and produce a precise, reproducible proof‑of‑concept.
-
-Out-of-scope vulnerability types (must NOT be reported):
-- Gas optimizations, micro-optimizations, or stylistic improvements:contentReference.
-- Incorrect event values or view function outputs that do not affect protocol state:contentReference
-- Missing zero-address checks or user-input validation that only prevents user mistakes; assume users preview their transactions.
-- Admin misconfiguration or reckless admin calls; the admin is trusted so  dont give me vulnerabilty tied to that this is very important 
-- Blacklisting/whitelisting or freezing of contract/admin addresses unless it enables a non‑privileged attacker
-- Front‑running initializers or race conditions that cause no irreparable damage and can be fixed by redeployment:contentReference
-- Pure user‑experience issues (temporary inconveniences, UI bugs, minor rounding dust) except its has valid impact 
-- Loss of rewards/airdrops or accidental direct token transfers that only hurt the sender
-- Storage‑gap omissions in simple inheritance structures
-- Stale‑price/round completeness checks unless explicitly required by the protocol
-- Any issue that cannot be realistically triggered, relies on hypothetical future code, third‑party oracle misbehaviour, network reorgs or sequencer downtime
-- Attacks requiring privileged keys/addresses, leaked credentials, physical device access, 51% or Sybil attacks, or stablecoin depegging
-- Testing or attacks on out‑of‑scope contracts, test files, configuration files or third‑party systems
-- Best‑practice recommendations, feature requests, UX/UI improvements, missing headers, clickjacking on non‑sensitive pages, rate‑limit suggestions, or any other low/no‑impact web/mobile bug
-- Vulnerabilities that depend solely on weird/non‑standard tokens unless explicitly declared in scope
-- Approve race conditions and similar deprecated ERC‑20 patterns
-- Known issues marked “won’t fix” or acknowledged in previous contests
-
-Minimal validation checklist (MUST PASS for a valid finding):
-1. **Confirm call flow** – Set up the necessary preconditions (e.g., deploy pool, add liquidity, create orders) and then walk through the full exploit sequence from the external entry point. Verify that each call and modifier is actually satisfied; do not assume bypasses that are blocked by `require` statements or modifiers in normal flow.
-2. **Track state changes** – Capture the values of all relevant variables (balances, totalFunds, votes, counters) before and after each step. Show exactly where an invariant is broken, funds are misallocated, or a state variable drifts from its intended value.
-3. **Use realistic values** – Choose input values that are within the range a normal user could supply on-chain: non-zero amounts, proper decimals, and values that satisfy bounds checks. Make sure any arithmetic (multiplications, divisions, modulo) with these values does not overflow or underflow, and that rounding errors cause a real financial impact rather than negligible dust.
-4. **Demonstrate the effect** – Prove that the exploit yields a concrete advantage  rather than merely causing a revert or requiring a careless user. Findings that depend on user/admin mistakes are considered.
-5. **Provide a runnable test** – Write a minimal, reproducible test case using the project’s test framework and codebase that executes the exploit sequence and asserts the incorrect outcome. Code4rena explicitly requires coded, runnable PoCs for Medium/High findings If the test does not run or the exploit cannot be reproduced, the issue is invalid.
-6. **Exclude out‑of‑scope scenarios** – Do not rely on hypothetical future code changes, misbehaving oracles, leaked keys, privileged actors, Sybil/51% attacks, or other conditions listed in the out‑of‑scope section. If an exploit depends on any of these, it should not be reported.
-7. **make sure you check the code with flow, dont report a vulnerabilty when u haven't checked how its been called from the entrypoint to the end 
-
-
-Only when all of the above checks pass should a vulnerability be reported as valid. Otherwise, return “#NoVulnerability found for this question.”
-
-Note make the report short and understandable and not too long 
-
-Audit Report
-
-## Title
-[Clear and specific name of the vulnerability related to the question]
-
-## Summary
-Short, direct summary of the issue and where it occurs.
-
-## Impact
-Low or Medium or HIgh 
-
-## Finding Description
-Explain the vulnerability step-by-step:
-- where in the code / which component,
-- what the intended logic is,
-- what the actual logic is,
-- how an attacker / user can reach it,
-- which security guarantee is broken (authz, accounting, invariant, DoS, etc.).
-Keep it tight but undeniable.
-
-## Impact Explanation
-Explain the concrete impact (fund loss, permanent lock, wrong accounting, privilege escalation, market skew, protocol invariant break).
-
-## Likelihood Explanation
-How likely is this to be hit in real usage? (e.g. callable by anyone, common flow, requires specific state, etc.)
-
-## Recommendation
-Give a concise fix direction and, if possible, a short code-level suggestion (no big refactors).
-
-## Proof of Concept
-Show a minimal scenario/test/call sequence that demonstrates the issue.
-- setup
-- action
-- observed broken state / wrong value / bypass
-- Make sure to provide the actual test function using the  codebase with their test setup that must actually  work to prove this vulnerability 
-
-If **no** vulnerability is found that matches this exact question, output ONLY:
-#NoVulnerability found for this question. Note Put the hashtag 
-
-Do not output anything else if there is no vulnerability.
-"""
-    return prompt
+    """Strip and cap the question; short ones are interned so repeats share one string object."""
+    question = _truncate_middle(question.strip())
+    if len(question) < _MAX_INTERNED_LENGTH:
+        question = sys.intern(question)
+    return _question_format(question)
 
 
 def validation_format(report: str) -> str:
-    prompt = f"""
-You are a Senior Web3 Security Researcher  Judge. Your task is *validation* of a single security question/claim (not the writing style of the report). The string below is the security *report/claim* to investigate and validate:
-
-SECURITY QUESTION / CLAIM (scope for this run):
-{report}
-
-================================================================================================================================================
-Your mission (precise):
-
-1) **Treat the claim as the starting point** — do not argue about report grammar or who wrote it. Instead, *investigate whether the underlying technical claim is a valid, exploitable vulnerability in the codebase.* Use code, tests, DeepWiki pages, and real flows to confirm or refute the claim.
-
-2) **Search & cross-check**:
-   - Inspect all code paths relevant to the claim: entrypoints, helpers, storage, config, libraries, protocol/version switches.
-   - Search DeepWiki (or other provided knowledge sources) for prior reports, mitigations, or acknowledged issues related to the same logic. Summarize relevant pages and links briefly to support your verdict.
-   - Check for previous public disclosures, acknowledged issues, or official “won’t-fix” notes that would invalidate the finding.
-
-3) **Platform acceptance rules** (must be enforced). When deciding if the claim is a real, reportable vulnerability, use these judge filters (if ANY apply, the finding is invalid ):
-
-   Automatic *invalid / rejected* conditions (if any apply -> **reject** and return `#NoVulnerability found for this question.`):
-   - The issue is a pure admin misconfiguration or requires privileged keys (admins are trusted) except it would have an impact that is irreversible 
-   - The issue is only a gas optimization, style, or UX issue.
-   - The issue cannot be triggered on-chain (no sequence of on-chain calls can reproduce it).
-   - No realistic attacker/sequence: requires leaked private keys, 51%/consensus attacks, Sybil or censoring attackers, off-chain oracle manipulations beyond the contract assumptions, chain reorganizations, or other external improbable events.
-   - The reported impact is contradictory to code behavior (e.g., you find the code already protects the path).
-   - The issue depends solely on weird/unsupported token implementations unless the project explicitly includes them in scope.
-   - The issue is a duplicate of already-acknowledged/wont-fix issues listed in DeepWiki or the repo’s issue tracker (unless the report adds new exploitability).
-   - The issue only affects off-chain tooling, docs, or test-only code.
-   - The vulnerability cannot produce a concrete security impact (fund loss, irrevocable lock, invariant break, prolonged DoS) — e.g., it only causes a revert for a single user but not a systemic problem.
-
-   Platform-specific acceptance heuristics (apply all):
-   - : Requires a precise call flow, state changes, and a runnable PoC (forge/test or similar) that demonstrates the exploit within the repo’s tests. No admin-only assumptions. Concrete financial or availability impact required for Low/Medium/High.
-   - : Prefers on-chain exploitability with measurable financial impact or critical availability/security impact. Runnable PoC desirable. Low-impact or purely informational reports are usually not eligible for bounties.
-   - : Similar rules — reproducible PoC, clear impact, no admin-only errors, no theoretical/remote dependencies.
-
-4) **Language & test harness expectations (be language-aware)**:
-   - **Solidity / EVM**: Provide Foundry/Hardhat test or snippet that runs inside the repository tests (e.g., `forge test` or `hardhat test`). Use contract addresses in the repo and realistic on-chain values.
-   - **Move**: Provide a Move unit test or CLI script using the repo’s test harness / Move prover that reproduces the behavior.
-   - **Rust (Sorboban / Substrate)**: Provide a Soroban test (#[test]) or substrate unit test matching the codebase’s test harness and compiling with the repo.
-   - **Go (Cosmos SDK)**: Provide a Go unit/integration test scenario from the repo’s testing framework that reproduces the issue (e.g., with simapp or chain-integration tests).
-   - If a runnable PoC is not technically possible in the repo context (e.g., needs a live chain or complex infra), the issue is invalid unless a *deterministic local test* can be provided that demonstrates the logic failure.
-   - Note my test may be wrong because its automated so ur goal is to check the report and the protocol itself to see if its valid or not 
-
-5) **Minimal validation checklist (ALL must pass for a valid finding)**:
-   1. **Confirm call flow** — show the exact sequence of calls from an external entrypoint to the vulnerable internal function. Demonstrate ability to satisfy any `require`/`auth` checks.
-   2. **Track state changes** — show before/after snapshots of all relevant storage variables and account balances proving the invariant break or DoS.
-   3. **Realistic values** — use values a real user could provide on-chain and show they fit existing bounds. Avoid hypothetical huge numbers unless those are within the type limits and reachable via normal admin/setters described in repo.
-   4. **Demonstrate effect** — show concrete impact (fund loss, frozen funds, persistent DoS, wrong accounting, privilege escalation). A revert-only bug with no systemic impact is typically invalid.
-   5. **Provide runnable test** — include a minimal test that runs in the repo’s test framework and reproduces the issue. Tests must compile/run. (If you cannot produce a test because of external dependencies, the report is invalid.)
-   6. **No privileged assumptions** — attacker must be a non-privileged caller unless the claim is about a subtle admin logic bug (in which case still show how it breaks security beyond normal admin actions).
-   7. **Exclude out-of-scope scenarios** — ensure it does not rely on consensus/infra/third-party conditions listed earlier.
-
-6) **What to produce**:
-   - If you **find a valid vulnerability** (ALL checks above pass), produce the report **in this exact format** (do not add other commentary):
-     ```
-     Audit Report
-
-     ## Title
-     [Clear and specific name of the vulnerability related to the question]
-
-     ## Summary
-     Short, direct summary of the issue and where it occurs.
-
-     ## Impact
-     Low or Medium or High
-
-     ## Finding Description
-     - location: <file:line or module>
-     - intended logic:
-     - actual logic:
-     - exploitation path (step-by-step, caller, preconditions)
-     - security guarantee broken
-
-     ## Impact Explanation
-     Concrete effects (fund loss, DoS, locked state, wrong accounting, etc.)
-
-     ## Likelihood Explanation
-     How likely — caller privilege, state preconditions, frequency.
-
-     ## Recommendation
-     Short code-level fix or mitigation.
-
-     ## Proof of Concept
-     Provide a runnable test/PoC using the repository's test harness:
-     - exact file & function to add
-     - simple setup
-     - actions to execute
-     - assert expected failure/impact
-     ```
-
-   - If you **do not** find a valid vulnerability, you MUST output exactly this single line (no additional text):
-     ```
-     #NoVulnerability found for this question.
-     Pls very important because this is what i would use to know automated if its invalid 
-     ```
-
-7) **DeepWiki / Prior art check**:
-   - Search DeepWiki entries (or provided knowledge base) for identical / related issues and whether the project already acknowledged or patched this behavior; if acknowledged and fixed, treat as non-reportable unless the PoC demonstrates residual exploitation after the claimed fix.
-   - If DeepWiki shows the issue is intentionally accepted design (with rationale), treat as non-reportable unless you can show a real exploit that design does not mitigate.
-
-
-8) **Be strict & conservative**:
-   - If the only effect is a reverted call for a single non-critical action with no larger impact, return `#NoVulnerability found for this question.`
-
-================================================================================================================================================
-Now perform the validation and respond exactly as required in section (6) above.
-"""
-    return prompt
+    return _validation_format(_truncate_middle(report.strip()))
+
+
+def questions_format(questions: list[str]) -> str:
+    """Build one prompt covering every question; parse the answer with split_reports."""
+    if not questions:
+        raise ValueError("questions_format needs at least one question")
+    numbered = "\n".join(f"{i}. {_truncate_middle(question.strip())}" for i, question in enumerate(questions, 1))
+    if len(numbered) > MAX_BATCH_INPUT_CHARS:
+        raise ValueError(
+            f"{len(questions)} questions add up to {len(numbered)} characters, "
+            f"over MAX_BATCH_INPUT_CHARS ({MAX_BATCH_INPUT_CHARS}); split them into smaller batches"
+        )
+    return _questions_template().replace("<<QUESTIONS>>", numbered)
+
+
+def split_reports(response: str) -> dict[int, str]:
+    """Map each question number to its answer in a questions_format response.
+
+    No-finding answers appear inside individual blocks, so a batch response must be
+    filtered per block: checking the whole response for "#NoVulnerability" (as
+    audit.GetReports does) would discard every finding in the batch.
+    """
+    return {int(number): report.strip() for number, report in _REPORT_BLOCK.findall(response)}
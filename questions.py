@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 questions = [
     # === Consensus Logic & State Transitions (20 questions) ===
     "Does the validateHeight function in baseapp.go:760-785 properly prevent block height manipulation attacks where an attacker provides a height that skips blocks or goes backward?",
@@ -3580,48 +3582,9 @@ questions = [
 ]
 
 
-def question_format(question: str) -> str:
-    prompt = f"""
-You are a Web3 Security Researcher. Your task is to analyze the given codebase (an L1 blockchain protocol or client) with a laser focus on this single question:
-
-**Security Question (scope for this run):** {question}
+_NO_VULNERABILITY = "#NoVulnerability found for this question."
 
-Your mission:
-- Use the security question as your starting point. Investigate all code paths, system components, and protocol logic related to that question and look for one concrete, exploitable vulnerability. Do not debate the premise of the question; accept it and investigate thoroughly.
-- Explore a wide range of realistic input scenarios and edge cases. Test large and small values (e.g. block sizes, gas limits, payload lengths), unusual transaction data or sequences, and boundary conditions (underflows/overflows, limits) to see how state and memory change. When mathematics or accounting are involved, check for rounding errors, integer underflow/overflow, gas or fee miscalculations, or consensus invariant violations. Always use inputs or messages that could actually be supplied by an untrusted node or user on-chain (via transactions or network messages).
-- Work through complete flows end‑to‑end: simulate how an unprivileged user’s transaction or a malicious network peer’s message would propagate and be processed by the system, how the different node roles (sequencer, executor, validator, etc.) handle it, and how state variables or consensus state evolve. Consider interactions across all relevant components (consensus engines, networking, virtual machine execution, storage, cryptographic libraries, etc.) and track how data moves through them. Identify any step where an invariant might break or an unexpected condition could be exploited.
-- If you find a vulnerability, produce a report in the exact format below. If **no** valid vulnerability emerges, clearly state: **“#NoVulnerability found for this question.”** (with the hashtag, exactly as shown, and nothing else).
-- Do not invent or repeat findings you’ve reported for this question in previous runs. Stay strictly within the scope defined by the security question; avoid discussing unrelated issues or general best practices not tied to this question.
-- Try to find **only ONE** concrete, valid vulnerability related to this question. The goal is quality over quantity. Focus your investigation deeply on this potential issue and ignore other tangential problems.
-- Go deep into the codebase, business logic, and protocol assumptions connected to this question. Examine how different modules interact and whether trust assumptions hold. Do not just surface-level scan; reason about the system’s behavior under adverse conditions relevant to the question.
-
-Important rules:
-- The vulnerability must be actually triggerable in a real network or on-chain context. Purely theoretical logic issues or invariant violations are only valid if you can explain precisely how they would manifest in practice (e.g. causing a consensus failure, node crash, financial loss, etc.).
-- Be 100% certain the issue is exploitable. When in doubt or if you cannot concretely demonstrate an exploit scenario, report **“#NoVulnerability found for this question.”**
-- Focus on external attack surfaces (non-privileged actors) first. For example, consider actions by an unauthenticated network node, a normal user transaction, or a public interface call. If the relevant functionality is restricted to privileged roles (e.g. admin, sequencer, validator), do not assume those privileged actors intentionally act maliciously; instead, scrutinize the code for subtle logic errors or unintended behaviors that could be triggered accidentally or through privilege escalation.
-- Provide a working proof-of-concept using the project’s test framework to demonstrate the exploit whenever possible. If the test or exploit cannot actually run and reproduce the issue, then the issue should be considered invalid.
-- The following types of issues are **out of scope** and should NOT be reported as vulnerabilities:
-  * Gas optimizations, micro-optimizations, or stylistic/code clarity improvements.
-  * Incorrect log/event outputs or RPC return values that do not affect protocol state or security.
-  * Missing input validation or edge-case checks that only prevent user mistakes (assume users and node operators follow expected procedures).
-  * Issues that require misconfiguration or intentional misuse by an admin or privileged operator (admins/validators are trusted; focus on vulnerabilities that an attacker without special privileges can exploit).
-  * Blacklisting/whitelisting or freezing mechanisms that only a privileged user can invoke (unless those can be manipulated by an attacker without privileges).
-  * Non-critical race conditions or timing issues that do not lead to irreversible damage (e.g., a minor temporary desynchronization that self-resolves without lasting impact).
-  * Pure user-experience or UI/CLI issues (e.g. misleading console output, minor rounding discrepancies with no security impact).
-  * Minor loss of funds or “dust” amount issues that only occur due to user error or expected protocol behavior (and do not pose a systemic risk).
-  * Issues dependent on hypothetical future code changes or external services beyond the current codebase’s control (e.g., assumptions about future modules, off-chain oracles misbehaving outside stated assumptions, 51% attacks or other consensus attacks requiring overwhelming external power, network-level attacks outside the node’s control).
-  * Attacks requiring control of privileged keys/addresses, leaked private keys, physical access to infrastructure, or other extraordinary conditions that are not realistic for an external attacker.
-  * Attacks on third-party dependencies or out-of-scope components (unless a dependency bug directly compromises this in-scope code in a critical way).
-  * Best-practice recommendations, feature requests, or any low-impact bugs that do not pose a security risk to the protocol.
-- Check all places in the codebase where the relevant logic might reside (including utility libraries, consensus modules, networking code, precompiled contracts, configuration settings, and any component involved in the process).
-- Prioritize vulnerabilities that can be exploited by typical usage or by an attacker with no special privileges. If a function or action is only accessible to a privileged role, any issue must be a subtle bug that could cause a security failure beyond just that actor’s misbehavior.
-- Do not go out of scope of the question. Avoid discussing anything that isn’t directly related to the specific security question.
-- Ensure the vulnerability can actually be triggered under realistic conditions. If an issue only occurs under extremely contrived scenarios or requires numerous unlikely prerequisites, treat it as not a valid finding.
-- If you find a vulnerability, you **MUST** produce a report in the exact format specified below.
-- If you do **not** find any valid vulnerability, you **MUST** output **only** the line: **“#NoVulnerability found for this question.”** (with no additional commentary or text).
-
-In Scope Impact: ( If a vuln is not part of this scope pls consider it invalid ) 
-* Direct loss of funds
+_IN_SCOPE_IMPACTS = """* Direct loss of funds
 * Critical Permanent freezing of funds (fix requires hard fork)
 * High RPC API crash affecting projects with greater than or equal to 25% of the market capitalization on top of the respective layer
 * High Unintended permanent chain split requiring hard fork (network partition requiring hard fork)
@@ -3633,9 +3596,9 @@ In Scope Impact: ( If a vuln is not part of this scope pls consider it invalid )
 * Medium  Causing network processing nodes to process transactions from the mempool beyond set parameters
 * Low Shutdown of greater than 10% or equal to but less than 30% of network processing nodes without brute force actions, but does not shut down the network
 * Low Modification of transaction fees outside of design parameters
+"""
 
-
-Audit Report
+_AUDIT_REPORT_SCHEMA = """Audit Report
 
 ## Title
 [Clear and specific name of the vulnerability related to the question]
@@ -3676,20 +3639,59 @@ Provide a minimal, reproducible proof-of-concept (PoC) demonstrating the issue u
 - Trigger: Execute the actions that trigger the vulnerability (e.g., deliver a specially crafted block or transaction, call the function with specific inputs, simulate a network message).
 - Observation: Explain what the test observes (e.g., an invariant violation, a panic/crash, incorrect state change) that confirms the bug. The test should fail (or detect the issue) on the vulnerable code.
 - This PoC should be ready to run within the project’s test suite to prove the issue.
+"""
+
+# Static instructions come first and the per-run question/report last, so every
+# prompt shares the same prefix.
+_QUESTION_PROMPT_PREFIX = """
+You are a Web3 Security Researcher. Your task is to analyze the given codebase (an L1 blockchain protocol or client) with a laser focus on the single security question given at the end of this prompt.
+
+Your mission:
+- Use the security question as your starting point. Investigate all code paths, system components, and protocol logic related to that question and look for one concrete, exploitable vulnerability. Do not debate the premise of the question; accept it and investigate thoroughly.
+- Explore a wide range of realistic input scenarios and edge cases. Test large and small values (e.g. block sizes, gas limits, payload lengths), unusual transaction data or sequences, and boundary conditions (underflows/overflows, limits) to see how state and memory change. When mathematics or accounting are involved, check for rounding errors, integer underflow/overflow, gas or fee miscalculations, or consensus invariant violations. Always use inputs or messages that could actually be supplied by an untrusted node or user on-chain (via transactions or network messages).
+- Work through complete flows end‑to‑end: simulate how an unprivileged user’s transaction or a malicious network peer’s message would propagate and be processed by the system, how the different node roles (sequencer, executor, validator, etc.) handle it, and how state variables or consensus state evolve. Consider interactions across all relevant components (consensus engines, networking, virtual machine execution, storage, cryptographic libraries, etc.) and track how data moves through them. Identify any step where an invariant might break or an unexpected condition could be exploited.
+- If you find a vulnerability, produce a report in the exact format below. If **no** valid vulnerability emerges, clearly state: **“#NoVulnerability found for this question.”** (with the hashtag, exactly as shown, and nothing else).
+- Do not invent or repeat findings you’ve reported for this question in previous runs. Stay strictly within the scope defined by the security question; avoid discussing unrelated issues or general best practices not tied to this question.
+- Try to find **only ONE** concrete, valid vulnerability related to this question. The goal is quality over quantity. Focus your investigation deeply on this potential issue and ignore other tangential problems.
+- Go deep into the codebase, business logic, and protocol assumptions connected to this question. Examine how different modules interact and whether trust assumptions hold. Do not just surface-level scan; reason about the system’s behavior under adverse conditions relevant to the question.
 
+Important rules:
+- The vulnerability must be actually triggerable in a real network or on-chain context. Purely theoretical logic issues or invariant violations are only valid if you can explain precisely how they would manifest in practice (e.g. causing a consensus failure, node crash, financial loss, etc.).
+- Be 100% certain the issue is exploitable. When in doubt or if you cannot concretely demonstrate an exploit scenario, report **“#NoVulnerability found for this question.”**
+- Focus on external attack surfaces (non-privileged actors) first. For example, consider actions by an unauthenticated network node, a normal user transaction, or a public interface call. If the relevant functionality is restricted to privileged roles (e.g. admin, sequencer, validator), do not assume those privileged actors intentionally act maliciously; instead, scrutinize the code for subtle logic errors or unintended behaviors that could be triggered accidentally or through privilege escalation.
+- Provide a working proof-of-concept using the project’s test framework to demonstrate the exploit whenever possible. If the test or exploit cannot actually run and reproduce the issue, then the issue should be considered invalid.
+- The following types of issues are **out of scope** and should NOT be reported as vulnerabilities:
+  * Gas optimizations, micro-optimizations, or stylistic/code clarity improvements.
+  * Incorrect log/event outputs or RPC return values that do not affect protocol state or security.
+  * Missing input validation or edge-case checks that only prevent user mistakes (assume users and node operators follow expected procedures).
+  * Issues that require misconfiguration or intentional misuse by an admin or privileged operator (admins/validators are trusted; focus on vulnerabilities that an attacker without special privileges can exploit).
+  * Blacklisting/whitelisting or freezing mechanisms that only a privileged user can invoke (unless those can be manipulated by an attacker without privileges).
+  * Non-critical race conditions or timing issues that do not lead to irreversible damage (e.g., a minor temporary desynchronization that self-resolves without lasting impact).
+  * Pure user-experience or UI/CLI issues (e.g. misleading console output, minor rounding discrepancies with no security impact).
+  * Minor loss of funds or “dust” amount issues that only occur due to user error or expected protocol behavior (and do not pose a systemic risk).
+  * Issues dependent on hypothetical future code changes or external services beyond the current codebase’s control (e.g., assumptions about future modules, off-chain oracles misbehaving outside stated assumptions, 51% attacks or other consensus attacks requiring overwhelming external power, network-level attacks outside the node’s control).
+  * Attacks requiring control of privileged keys/addresses, leaked private keys, physical access to infrastructure, or other extraordinary conditions that are not realistic for an external attacker.
+  * Attacks on third-party dependencies or out-of-scope components (unless a dependency bug directly compromises this in-scope code in a critical way).
+  * Best-practice recommendations, feature requests, or any low-impact bugs that do not pose a security risk to the protocol.
+- Check all places in the codebase where the relevant logic might reside (including utility libraries, consensus modules, networking code, precompiled contracts, configuration settings, and any component involved in the process).
+- Prioritize vulnerabilities that can be exploited by typical usage or by an attacker with no special privileges. If a function or action is only accessible to a privileged role, any issue must be a subtle bug that could cause a security failure beyond just that actor’s misbehavior.
+- Do not go out of scope of the question. Avoid discussing anything that isn’t directly related to the specific security question.
+- Ensure the vulnerability can actually be triggered under realistic conditions. If an issue only occurs under extremely contrived scenarios or requires numerous unlikely prerequisites, treat it as not a valid finding.
+- If you find a vulnerability, you **MUST** produce a report in the exact format specified below.
+- If you do **not** find any valid vulnerability, you **MUST** output **only** the line: **“#NoVulnerability found for this question.”** (with no additional commentary or text).
+
+In Scope Impact: ( If a vuln is not part of this scope pls consider it invalid ) 
+""" + _IN_SCOPE_IMPACTS + """
+
+""" + _AUDIT_REPORT_SCHEMA + """
 If **no** vulnerability is found for this question, output ONLY:
-#NoVulnerability found for this question.
+""" + _NO_VULNERABILITY + """
 (Do not output anything else if there is no vulnerability.)
-"""
-    return prompt
 
+**Security Question (scope for this run):** """
 
-def validation_format(report: str) -> str:
-    prompt = f"""
-You are a Senior Web3 Security Researcher **Judge**. Your task is *validation* of a single security question/claim. The string below is the security **report/claim** to investigate and validate:
-
-SECURITY QUESTION / CLAIM (scope for this run):
-{report}
+_VALIDATION_PROMPT_PREFIX = """
+You are a Senior Web3 Security Researcher **Judge**. Your task is *validation* of a single security question/claim. The security **report/claim** to investigate and validate is given at the end of this prompt.
 
 ================================================================================================================================================
 Your mission:
@@ -3738,70 +3740,15 @@ Your mission:
 6) The vulnerabilty must be one of this impacts and if its not pls consider it not valid #NoVulnerability, if the vulnearabilty cant be triggred also consider it not valid,
  be a very strict judge and only validate the vulnerability if its valid or not, it must be one of the below if not its invalid 
  
- * Direct loss of funds
-* Critical
-* Permanent freezing of funds (fix requires hard fork)
-* High
-* RPC API crash affecting projects with greater than or equal to 25% of the market capitalization on top of the respective layer
-* High
-* Unintended permanent chain split requiring hard fork (network partition requiring hard fork)
-* High
-* Network not being able to confirm new transactions (total network shutdown)
-* Medium
-* Increasing network processing node resource consumption by at least 30% without brute force actions, compared to the preceding 24 hours
-* Medium
-* Shutdown of greater than or equal to 30% of network processing nodes without brute force actions, but does not shut down the network
-* Medium
-* A bug in the respective layer 0/1/2 network code that results in unintended smart contract behavior with no concrete funds at direct risk
-* Medium
-* Temporary freezing of network transactions by delaying one block by 500% or more of the average block time of the preceding 24 hours beyond standard difficulty adjustments
-* Medium
-* Causing network processing nodes to process transactions from the mempool beyond set parameters
-* Low
-* Shutdown of greater than 10% or equal to but less than 30% of network processing nodes without brute force actions, but does not shut down the network
-* Low
-* Modification of transaction fees outside of design parameters
-
+ """ + _IN_SCOPE_IMPACTS + """
 
 7) **Outcome & Response**:
    - If you confirm the claim is a **valid vulnerability** (all checks passed), output the following **Audit Report** format, ensuring clarity and completeness:
-     ```
-     Audit Report
-
-     ## Title
-     [Clear and specific name of the vulnerability related to the question]
-
-     ## Summary
-     Short, direct summary of the issue and where it occurs.
-
-     ## Impact
-     Low / Medium / High
-
-     ## Finding Description
-     - location: <file and line number or module name where the issue occurs>
-     - intended logic: <explanation of the intended correct behavior>
-     - actual logic: <explanation of the flawed behavior happening instead>
-     - exploitation path: <how an attacker triggers the issue, step by step from entry to impact>
-     - security guarantee broken: <which security property or invariant is violated>
-
-     ## Impact Explanation
-     Describe the impact in terms of consequences (fund loss, network halt, etc.).
-
-     ## Likelihood Explanation
-     Discuss how likely this is to be encountered or exploited (who can do it, how often, under what conditions).
-
-     ## Recommendation
-     Suggest a fix or mitigation (e.g., code change or additional check).
-
-     ## Proof of Concept
-     Provide a test or script (with file name and function) that reproduces the issue:
-     - setup (initial state or prep steps)
-     - action (the call/transaction or sequence that triggers the bug)
-     - result (the observed incorrect outcome or error indicating the bug)
-     ```
+```
+""" + _AUDIT_REPORT_SCHEMA + """```
    - If you determine **no valid vulnerability** exists (the claim fails any of the above criteria), you **must** respond with exactly:
      ```
-     #NoVulnerability found for this question.
+     """ + _NO_VULNERABILITY + """
      ```
 
 7) **Prior Art & Intentional Behavior**:
@@ -3814,5 +3761,17 @@ Your mission:
 
 ================================================================================================================================================
 Now perform the validation and respond with either the **Audit Report** (if the claim is valid) or **#NoVulnerability found for this question.** (if invalid), strictly following the above instructions.
+
+SECURITY QUESTION / CLAIM (scope for this run):
 """
-    return prompt
+
+
+@lru_cache(maxsize=256)
+def question_format(question: str) -> str:
+    question = " ".join(question.split())
+    return _QUESTION_PROMPT_PREFIX + question + "\n"
+
+
+@lru_cache(maxsize=256)
+def validation_format(report: str) -> str:
+    return _VALIDATION_PROMPT_PREFIX + report + "\n"
@@ -40,6 +40,7 @@ try:
         print(f"[{i + 1}/{total}] Processing: {question[:50]}...")
         bot = Deepwiki(teardown=True)
         bot.ask_question(question, is_reversed=False)
+        processed.add(question)
         processed_count += 1
 
         counter += 1
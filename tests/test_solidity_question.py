@@ -0,0 +1,49 @@
+import importlib.util
+import unittest
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).resolve().parent.parent / "prompt" / "solidity_question.py"
+_spec = importlib.util.spec_from_file_location("solidity_question", _MODULE_PATH)
+solidity_question = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(solidity_question)
+
+
+class SplitReportsTest(unittest.TestCase):
+    def test_lf_blocks(self):
+        response = "--- BEGIN REPORT 1 ---\nfirst\n--- END REPORT 1 ---\n--- BEGIN REPORT 2 ---\nsecond\n--- END REPORT 2 ---\n"
+        self.assertEqual(solidity_question.split_reports(response), {1: "first", 2: "second"})
+
+    def test_crlf_blocks(self):
+        response = "--- BEGIN REPORT 1 ---\r\nline one\r\nline two\r\n--- END REPORT 1 ---\r\n"
+        self.assertEqual(solidity_question.split_reports(response), {1: "line one\r\nline two"})
+
+    def test_trailing_spaces_on_delimiters(self):
+        response = "--- BEGIN REPORT 3 --- \t\nbody\n  --- END REPORT 3 ---  \n"
+        self.assertEqual(solidity_question.split_reports(response), {3: "body"})
+
+    def test_empty_block(self):
+        response = "--- BEGIN REPORT 1 ---\n--- END REPORT 1 ---\n--- BEGIN REPORT 2 ---\r\n\r\n--- END REPORT 2 ---"
+        self.assertEqual(solidity_question.split_reports(response), {1: "", 2: ""})
+
+
+class QuestionsFormatTest(unittest.TestCase):
+    def test_rejects_empty_batch(self):
+        with self.assertRaises(ValueError):
+            solidity_question.questions_format([])
+
+    def test_rejects_oversized_batch(self):
+        questions = ["x" * solidity_question.MAX_INPUT_CHARS] * 3
+        with self.assertRaises(ValueError):
+            solidity_question.questions_format(questions)
+
+    def test_batch_wording(self):
+        prompt = solidity_question.questions_format(["first?", "second?"])
+        self.assertIn("1. first?\n2. second?", prompt)
+        self.assertNotIn("<<QUESTION", prompt)
+        self.assertNotIn("find **only ONE**", prompt)
+        self.assertNotIn("When in doubt, report", prompt)
+        self.assertNotIn("Otherwise, return", prompt)
+
+
+if __name__ == "__main__":
+    unittest.main()